@@ -7,17 +7,36 @@ It supports custom configurations, error handling, and detailed logging.
 """
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, NoCredentialsError, WaiterError
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
 import time
 import os
 import base64
+import textwrap
+import random
+import functools
 
 import yaml  # Add YAML support
+
+try:
+    import aioboto3  # Optional: only needed for async provisioning
+except ImportError:
+    aioboto3 = None
+
+try:
+    import orjson  # Optional: faster parsing of large config files
+except ImportError:
+    orjson = None
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, fields, replace
 import argparse
+import asyncio
 import sys
 
 
@@ -42,50 +61,236 @@ class EC2InstanceConfig:
     spot_retry_delay: int = 30
 
 
+# Config file keys that map onto EC2InstanceConfig; any other key is a cloud-init parameter
+_CONFIG_FIELDS = {field.name for field in fields(EC2InstanceConfig)}
+
+# Instance waiter polling: 5s resolution for up to 5 minutes
+INSTANCE_WAITER_CONFIG = {'Delay': 5, 'MaxAttempts': 60}
+
+# Connection pool for the async client, which runs every launch concurrently
+ASYNC_MAX_POOL_CONNECTIONS = 256
+
+# EC2 APIs that take lists of IDs accept at most this many per request
+MAX_IDS_PER_REQUEST = 1000
+
+# States from which an instance will never reach running
+STOPPED_INSTANCE_STATES = {'shutting-down', 'terminated', 'stopping', 'stopped'}
+
+# Public SSM parameter holding the current Ubuntu 24.04 LTS AMI in each region
+DEFAULT_AMI_PARAMETER = '/aws/service/canonical/ubuntu/server/24.04/stable/current/amd64/hvm/ebs-gp3/ami-id'
+
+# Launch errors that fail the same way on every attempt, so retrying only adds delay
+NON_RETRYABLE_ERROR_CODES = {
+    'InvalidParameterValue',
+    'InvalidParameterCombination',
+    'MissingParameter',
+    'InvalidAMIID.NotFound',
+    'InvalidAMIID.Malformed',
+    'InvalidKeyPair.NotFound',
+    'InvalidGroup.NotFound',
+    'InvalidSubnetID.NotFound',
+    'UnauthorizedOperation',
+    'AuthFailure'
+}
+
+# Error codes meaning the request was signed with missing or invalid credentials
+CREDENTIAL_ERROR_CODES = {'AuthFailure', 'ExpiredToken', 'RequestExpired'}
+
+
+def _chunked(items: List[str], size: int = MAX_IDS_PER_REQUEST) -> List[List[str]]:
+    """Split a list of IDs into chunks that fit in a single EC2 API request."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# Background listener that writes queued log records, started by the first provisioner
+_log_listener = None
+
+
+def _stop_log_listener():
+    """Flush queued log records and stop the background logging thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def _is_credential_error(error: Exception) -> bool:
+    """Return whether an API call failed because of missing or invalid credentials."""
+    if isinstance(error, NoCredentialsError):
+        return True
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in CREDENTIAL_ERROR_CODES
+    return False
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """Return whether a failed launch attempt is worth retrying."""
+    if _is_credential_error(error):
+        return False
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') not in NON_RETRYABLE_ERROR_CODES
+    return True
+
+
+def _backoff_delay(retry_delay: int) -> float:
+    """Return a full-jitter sleep so parallel workers don't retry in lockstep."""
+    return random.uniform(0, min(retry_delay, 120))
+
+
+def _spot_attempts(config: EC2InstanceConfig) -> int:
+    """Return how many spot launch attempts to make, always at least one."""
+    return max(config.spot_max_retries, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session(region_name: str) -> boto3.Session:
+    """Return a shared session for the region with its credentials resolved up front."""
+    session = boto3.Session(region_name=region_name)
+    
+    # Resolve the credential chain (env, profile, IMDS, ...) once here instead of on a worker's first call
+    credentials = session.get_credentials()
+    if credentials is not None:
+        credentials.get_frozen_credentials()
+    
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_default_ami(region_name: str) -> str:
+    """Look up the current Ubuntu 24.04 LTS (amd64) AMI for a region, once per region."""
+    ssm_client = _get_session(region_name).client('ssm')
+    return ssm_client.get_parameter(Name=DEFAULT_AMI_PARAMETER)['Parameter']['Value']
+
+
+def _boto_config(pool_size: int) -> Config:
+    """Build the botocore config used by the EC2 clients."""
+    return Config(
+        max_pool_connections=pool_size,
+        retries={'mode': 'adaptive', 'max_attempts': 10},
+        tcp_keepalive=True
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ec2_client(region_name: str, pool_size: int):
+    """Return a shared EC2 client; boto3 clients are thread safe and pool their connections."""
+    return _get_session(region_name).client('ec2', config=_boto_config(pool_size))
+
+
+def _get_async_session(region_name: str):
+    """Return an aioboto3 session using the credentials already resolved by the shared session."""
+    credentials = _get_session(region_name).get_credentials()
+    if credentials is None:
+        return aioboto3.Session(region_name=region_name)
+    
+    frozen = credentials.get_frozen_credentials()
+    return aioboto3.Session(
+        aws_access_key_id=frozen.access_key,
+        aws_secret_access_key=frozen.secret_key,
+        aws_session_token=frozen.token,
+        region_name=region_name
+    )
+
+
 class EC2Provisioner:
     """Handles EC2 instance provisioning in parallel."""
     
-    def __init__(self, region_name: str = 'us-east-1', max_workers: int = 5):
+    def __init__(self, region_name: str = 'us-east-1', max_workers: int = 5, validate: bool = False):
         """
         Initialize the EC2 provisioner.
         
         Args:
             region_name: AWS region name
             max_workers: Maximum number of parallel workers
+            validate: Check AWS credentials with STS up front instead of on the first launch
         """
         self.region_name = region_name
         self.max_workers = max_workers
-        self.ec2_client = boto3.client('ec2', region_name=region_name)
-        self.ec2_resource = boto3.resource('ec2', region_name=region_name)
+        
+        # Size the HTTPS pool for every worker's concurrent launch, waiter and tagging calls
+        pool_size = max(max_workers * 4, 50)
+        self.ec2_client = _get_ec2_client(region_name, pool_size)
         
         # Setup logging
         self._setup_logging()
         
-        # Validate AWS credentials
-        self._validate_credentials()
+        # Validate AWS credentials only when asked; otherwise the first launch reports them
+        if validate:
+            self._validate_credentials()
+        
+        # Long-lived worker pool shared by every provisioning and cleanup call, created last
+        # so a failed validation doesn't leave it running
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ec2-prov')
+    
+    def __enter__(self) -> 'EC2Provisioner':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Shut down the worker pool, waiting for submitted calls to finish."""
+        self._executor.shutdown()
     
     def _setup_logging(self):
         """Setup logging configuration."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
+        global _log_listener
+        
+        # Worker threads only enqueue records; a single listener thread does the file and console I/O.
+        # If the application already configured logging, leave it alone and log through its handlers.
+        if _log_listener is None and not logging.getLogger().handlers:
+            log_queue = queue.Queue(-1)
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            handlers = [
                 logging.FileHandler('ec2_provisioning.log'),
                 logging.StreamHandler(sys.stdout)
             ]
-        )
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            
+            _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+            _log_listener.start()
+            
+            # The listener thread is a daemon, so flush queued records before any process exits
+            atexit.register(_stop_log_listener)
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(message)s',
+                handlers=[logging.handlers.QueueHandler(log_queue)]
+            )
         self.logger = logging.getLogger(__name__)
     
     def _validate_credentials(self):
         """Validate AWS credentials and permissions."""
         try:
-            # Test AWS credentials by making a simple API call
-            self.ec2_client.describe_regions()
+            # Test AWS credentials with the cheapest signed call available
+            _get_session(self.region_name).client('sts').get_caller_identity()
             self.logger.info("AWS credentials validated successfully")
         except Exception as e:
             self.logger.error(f"Failed to validate AWS credentials: {e}")
             raise
     
+    def _log_credential_error(self, error: Exception):
+        """Log credential failures surfaced by a launch call, since credentials aren't checked up front."""
+        if _is_credential_error(error):
+            self.logger.error(f"Failed to validate AWS credentials: {error}")
+    
+    def _run_instances(self, **launch_params) -> Dict[str, Any]:
+        """Call run_instances, reporting credential failures like the eager check used to."""
+        try:
+            return self.ec2_client.run_instances(**launch_params)
+        except Exception as e:
+            self._log_credential_error(e)
+            raise
+    
+    async def _run_instances_async(self, ec2_client, **launch_params) -> Dict[str, Any]:
+        """Call run_instances on an aioboto3 client, reporting credential failures like _run_instances."""
+        try:
+            return await ec2_client.run_instances(**launch_params)
+        except Exception as e:
+            self._log_credential_error(e)
+            raise
+    
     def _create_block_device_mappings(self, config: EC2InstanceConfig) -> List[Dict[str, Any]]:
         """Create block device mappings for the instance."""
         return [
@@ -100,13 +305,20 @@ class EC2Provisioner:
             }
         ]
     
-    def _create_tags(self, config: EC2InstanceConfig, instance_id: str) -> List[Dict[str, str]]:
-        """Create tags for the instance."""
-        tags = [
-            {'Key': 'Name', 'Value': config.name},
+    def _create_base_tags(self) -> List[Dict[str, str]]:
+        """Create the tags shared by every instance in a provisioning run, applied at launch."""
+        return [
             {'Key': 'CreatedBy', 'Value': 'EC2Provisioner'},
             {'Key': 'CreationDate', 'Value': time.strftime('%Y-%m-%d')}
         ]
+    
+    def _create_tags(self, config: EC2InstanceConfig,
+                     base_tags: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """Create tags for the instance, on top of the run's shared base tags."""
+        if base_tags is None:
+            base_tags = self._create_base_tags()
+        
+        tags = base_tags + [{'Key': 'Name', 'Value': config.name}]
         
         if config.tags:
             for key, value in config.tags.items():
@@ -114,13 +326,23 @@ class EC2Provisioner:
         
         return tags
     
+    def _create_tag_specifications(self, tags: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Create run_instances TagSpecifications that tag the instances and their volumes at launch."""
+        return [
+            {
+                'ResourceType': resource_type,
+                'Tags': tags
+            }
+            for resource_type in ('instance', 'volume')
+        ]
+    
     def provision_instance(self, config: EC2InstanceConfig) -> Dict[str, Any]:
         """
         Provision a single EC2 instance (on-demand or spot).
         
         Args:
             config: EC2 instance configuration
-            
+        
         Returns:
             Dictionary containing instance information and status
         """
@@ -128,37 +350,8 @@ class EC2Provisioner:
             # Set default values for missing fields
             config = self._set_defaults(config)
             
-            self.logger.info(f"Starting provisioning for instance: {config.name}")
-            
-            # Prepare common launch parameters (without TagSpecifications for spot instances)
-            launch_params = {
-                'ImageId': config.image_id,
-                'InstanceType': config.instance_type,
-                'BlockDeviceMappings': self._create_block_device_mappings(config)
-            }
-            
-            # Add optional parameters only if provided
-            if config.key_name:
-                launch_params['KeyName'] = config.key_name
-            
-            if config.security_group_ids:
-                launch_params['SecurityGroupIds'] = config.security_group_ids
-            
-            if config.subnet_id:
-                launch_params['SubnetId'] = config.subnet_id
-            
-            if config.user_data:
-                # boto3 requires UserData to be base64 encoded manually
-                launch_params['UserData'] = base64.b64encode(config.user_data.encode('utf-8')).decode('utf-8')
-            
-            if config.iam_instance_profile:
-                launch_params['IamInstanceProfile'] = {'Name': config.iam_instance_profile}
-            
-            if config.spot_instance:
-                return self._launch_spot_instance(config, launch_params)
-            else:
-                return self._launch_on_demand_instance(config, launch_params)
-            
+            launch = self._submit_launch(config)
+        
         except Exception as e:
             error_msg = f"Failed to provision instance {config.name}: {str(e)}"
             self.logger.error(error_msg)
@@ -167,140 +360,434 @@ class EC2Provisioner:
                 'status': 'failed',
                 'error': str(e)
             }
+        
+        # Keep the instance ID in every result from here on so --cleanup can terminate it
+        instance_id = launch['instance_id']
+        
+        try:
+            # Wait for instance to be running, unless it already is
+            wait_errors = self._wait_for_running([instance_id])
+            if wait_errors:
+                # The instance was seen stopped or still not running, so don't leave it behind
+                self._terminate_failed_instances([instance_id])
+                raise Exception(wait_errors[instance_id])
+            
+            # Get instance details and create result; tags were applied at launch
+            instances = self._describe_running_instances([instance_id])
+            return self._finalize_instance(launch, instances.get(instance_id, {}))
+        
+        except Exception as e:
+            self.logger.error(f"Failed to provision instance {config.name}: {str(e)}")
+            return self._failed_launch_result(launch, str(e))
     
-    def _launch_on_demand_instance(self, config: EC2InstanceConfig, launch_params: Dict[str, Any]) -> Dict[str, Any]:
-        """Launch an on-demand EC2 instance."""
-        # Add MinCount, MaxCount, and TagSpecifications for on-demand instances
-        on_demand_params = launch_params.copy()
-        on_demand_params['MinCount'] = 1
-        on_demand_params['MaxCount'] = 1
-        on_demand_params['TagSpecifications'] = [
+    def _submit_launch(self, config: EC2InstanceConfig) -> Dict[str, Any]:
+        """
+        Submit the launch request for an instance without waiting for it to run.
+        
+        Args:
+            config: EC2 instance configuration with defaults applied
+        
+        Returns:
+            Launch record holding the config, instance ID, purchase option and deferred tags
+        """
+        launch = self._submit_launch_group([config])[0]
+        if 'error' in launch:
+            raise Exception(launch['error'])
+        return launch
+    
+    def _submit_launch_group(self, configs: List[EC2InstanceConfig],
+                             base_tags: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Submit one launch request for a group of configs sharing the same launch parameters.
+        
+        Args:
+            configs: Group of EC2 instance configurations produced by _group_configs
+            base_tags: Tags shared by every instance in the run
+        
+        Returns:
+            Launch records in the same order as the configs; configs left without
+            an instance get a record holding only the config and an error
+        """
+        for config in configs:
+            self.logger.info(f"Starting provisioning for instance: {config.name}")
+        
+        # Build launch parameters and tags once; spot retries reuse them
+        launch_params = self._build_launch_params(configs[0])
+        tag_lists = [self._create_tags(config, base_tags) for config in configs]
+        
+        if configs[0].spot_instance:
+            return [self._launch_spot_instance(configs[0], launch_params, tag_lists[0])]
+        else:
+            return self._launch_on_demand_instances(configs, launch_params, tag_lists)
+    
+    def _build_launch_params(self, config: EC2InstanceConfig) -> Dict[str, Any]:
+        """Build the launch parameters shared by on-demand and spot launches."""
+        # Prepare common launch parameters
+        launch_params = {
+            'ImageId': config.image_id,
+            'InstanceType': config.instance_type,
+            'BlockDeviceMappings': self._create_block_device_mappings(config)
+        }
+        
+        # Add optional parameters only if provided
+        if config.key_name:
+            launch_params['KeyName'] = config.key_name
+        
+        if config.security_group_ids:
+            launch_params['SecurityGroupIds'] = config.security_group_ids
+        
+        if config.subnet_id:
+            launch_params['SubnetId'] = config.subnet_id
+        
+        if config.user_data:
+            # boto3 requires UserData to be base64 encoded manually
+            launch_params['UserData'] = base64.b64encode(config.user_data.encode('utf-8')).decode('utf-8')
+        
+        if config.iam_instance_profile:
+            launch_params['IamInstanceProfile'] = {'Name': config.iam_instance_profile}
+        
+        return launch_params
+    
+    def _group_configs(self, configs: List[EC2InstanceConfig]) -> List[List[EC2InstanceConfig]]:
+        """
+        Group on-demand configs that can be launched by a single run_instances call.
+        
+        Spot configs each get their own group since every spot launch retries independently.
+        
+        Args:
+            configs: EC2 instance configurations with defaults applied
+        
+        Returns:
+            List of config groups
+        """
+        groups = {}
+        for index, config in enumerate(configs):
+            if config.spot_instance:
+                key = ('spot', index)
+            else:
+                key = (
+                    config.image_id,
+                    config.instance_type,
+                    config.subnet_id,
+                    tuple(config.security_group_ids or ()),
+                    config.key_name,
+                    config.iam_instance_profile,
+                    config.user_data,
+                    config.volume_size,
+                    config.volume_type
+                )
+            groups.setdefault(key, []).append(config)
+        return list(groups.values())
+    
+    def _launch_on_demand_instances(self, configs: List[EC2InstanceConfig], launch_params: Dict[str, Any],
+                                    tag_lists: List[List[Dict[str, str]]]) -> List[Dict[str, Any]]:
+        """Launch a group of identical on-demand EC2 instances with one request."""
+        # Only tags shared by the whole group can go in TagSpecifications; the rest,
+        # including per-instance names, are deferred to _tag_instances
+        common_tags = [tag for tag in tag_lists[0] if all(tag in tags for tags in tag_lists[1:])]
+        
+        # Launch the instances, accepting fewer than requested if capacity runs short
+        response = self._run_instances(**self._build_on_demand_params(launch_params, len(configs), common_tags))
+        
+        # Match instances to configs by launch index so names and tags land deterministically
+        instances = sorted(response['Instances'], key=lambda instance: instance['AmiLaunchIndex'])
+        
+        launches = [
             {
-                'ResourceType': 'instance',
-                'Tags': self._create_tags(config, '')
+                'config': config,
+                'instance_id': instance['InstanceId'],
+                'instance_type': 'on-demand',
+                'deferred_tags': [tag for tag in tags if tag not in common_tags]
             }
+            for config, tags, instance in zip(configs, tag_lists, instances)
         ]
         
-        # Launch the instance
-        response = self.ec2_client.run_instances(**on_demand_params)
-        instance_id = response['Instances'][0]['InstanceId']
+        shortfall_error = f"Only {len(instances)} of {len(configs)} requested instances were launched"
+        for config in configs[len(instances):]:
+            launches.append({'config': config, 'error': shortfall_error})
         
-        # Wait for instance to be running
-        self.logger.info(f"Waiting for instance {instance_id} to be running...")
-        waiter = self.ec2_client.get_waiter('instance_running')
-        waiter.wait(InstanceIds=[instance_id])
+        return launches
+    
+    def _build_on_demand_params(self, launch_params: Dict[str, Any], count: int,
+                                tags: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build run_instances parameters that launch up to count on-demand instances."""
+        # Add MinCount, MaxCount, and TagSpecifications for on-demand instances
+        on_demand_params = launch_params.copy()
+        on_demand_params['MinCount'] = 1
+        on_demand_params['MaxCount'] = count
+        on_demand_params['TagSpecifications'] = self._create_tag_specifications(tags)
+        return on_demand_params
+    
+    def _build_spot_params(self, config: EC2InstanceConfig, launch_params: Dict[str, Any],
+                           tags: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build run_instances parameters that request one-time spot capacity."""
+        spot_options = {'SpotInstanceType': 'one-time'}
+        
+        # Add max price if specified (optional - AWS will use on-demand price if not set)
+        if config.spot_max_price:
+            spot_options['MaxPrice'] = config.spot_max_price
+            self.logger.info(f"Setting spot max price to: {config.spot_max_price}")
+        else:
+            self.logger.info(f"No max price specified - AWS will use current on-demand price")
         
-        # Get instance details and create result
-        return self._finalize_instance(config, instance_id, 'on-demand')
+        spot_params = launch_params.copy()
+        spot_params['MinCount'] = 1
+        spot_params['MaxCount'] = 1
+        spot_params['InstanceMarketOptions'] = {
+            'MarketType': 'spot',
+            'SpotOptions': spot_options
+        }
+        spot_params['TagSpecifications'] = self._create_tag_specifications(tags)
+        return spot_params
     
-    def _launch_spot_instance(self, config: EC2InstanceConfig, launch_params: Dict[str, Any]) -> Dict[str, Any]:
+    def _launch_spot_instance(self, config: EC2InstanceConfig, launch_params: Dict[str, Any],
+                              tags: List[Dict[str, str]]) -> Dict[str, Any]:
         """Launch a spot EC2 instance with retry logic."""
-        max_retries = config.spot_max_retries
-        retry_delay = config.spot_retry_delay  # seconds
+        max_retries = _spot_attempts(config)
+        
+        # Request spot capacity through run_instances so the instance ID and tags come back in one call
+        spot_params = self._build_spot_params(config, launch_params, tags)
         
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"Spot instance attempt {attempt + 1}/{max_retries} for {config.name}")
                 
-                # Create spot instance request
-                spot_request_params = {
-                    'LaunchSpecification': launch_params,
-                    'Type': 'one-time'
-                }
-                
-                # Add max price if specified (optional - AWS will use on-demand price if not set)
-                if config.spot_max_price:
-                    spot_request_params['SpotPrice'] = config.spot_max_price
-                    self.logger.info(f"Setting spot max price to: {config.spot_max_price}")
-                else:
-                    self.logger.info(f"No max price specified - AWS will use current on-demand price")
-                
-                # Request spot instance
+                # Launch the spot instance
                 self.logger.info(f"Requesting spot instance for {config.name}...")
-                spot_response = self.ec2_client.request_spot_instances(**spot_request_params)
-                spot_request_id = spot_response['SpotInstanceRequests'][0]['SpotInstanceRequestId']
-                
-                # Wait for spot request to be fulfilled
-                self.logger.info(f"Waiting for spot request {spot_request_id} to be fulfilled...")
-                waiter = self.ec2_client.get_waiter('spot_instance_request_fulfilled')
-                waiter.wait(SpotInstanceRequestIds=[spot_request_id])
-                
-                # Get the instance ID from the fulfilled request
-                spot_request = self.ec2_client.describe_spot_instance_requests(
-                    SpotInstanceRequestIds=[spot_request_id]
-                )['SpotInstanceRequests'][0]
-                
-                instance_id = spot_request['InstanceId']
+                response = self._run_instances(**spot_params)
+                instance = response['Instances'][0]
                 
-                # Wait for instance to be running
-                self.logger.info(f"Waiting for spot instance {instance_id} to be running...")
-                waiter = self.ec2_client.get_waiter('instance_running')
-                waiter.wait(InstanceIds=[instance_id])
-                
-                # Get instance details and create result
-                result = self._finalize_instance(config, instance_id, 'spot')
-                result['spot_request_id'] = spot_request_id
+                self.logger.info(f"Spot instance {instance['InstanceId']} launched for {config.name} on attempt {attempt + 1}")
+                return {
+                    'config': config,
+                    'instance_id': instance['InstanceId'],
+                    'instance_type': 'spot',
+                    'spot_request_id': instance.get('SpotInstanceRequestId'),
+                    'deferred_tags': []
+                }
+            
+            except Exception as e:
+                # Wait before retrying
+                time.sleep(self._spot_retry_delay(config, attempt, e))
+    
+    def _spot_retry_delay(self, config: EC2InstanceConfig, attempt: int, error: Exception) -> float:
+        """
+        Handle a failed spot launch attempt, raising once the launch should give up.
+        
+        Args:
+            config: EC2 instance configuration being launched
+            attempt: Zero-based index of the attempt that failed
+            error: Exception raised by the attempt
+        
+        Returns:
+            Jittered backoff delay in seconds before the next attempt
+        """
+        max_retries = _spot_attempts(config)
+        self.logger.warning(f"Spot instance attempt {attempt + 1} failed for {config.name}: {str(error)}")
+        
+        # Don't retry errors that will fail the same way again
+        if not _is_retryable_error(error):
+            raise Exception(f"Spot instance launch failed for {config.name} with a non-retryable error: {str(error)}")
+        
+        # If this was the last attempt, raise the error
+        if attempt == max_retries - 1:
+            raise Exception(f"All {max_retries} spot instance attempts failed for {config.name}. Last error: {str(error)}")
+        
+        # Double the delay after each attempt (exponential backoff)
+        retry_delay = config.spot_retry_delay  # seconds
+        if attempt:
+            retry_delay = min(retry_delay * 2 ** attempt, 120)  # Cap at 2 minutes
+        
+        sleep_time = _backoff_delay(retry_delay)
+        self.logger.info(f"Waiting {sleep_time:.1f} seconds before retry...")
+        return sleep_time
+    
+    def _wait_for_running(self, instance_ids: List[str]) -> Dict[str, str]:
+        """
+        Wait for launched instances to be running with a single batched waiter.
+        
+        Args:
+            instance_ids: IDs of the launched instances
+        
+        Returns:
+            Dictionary mapping IDs of instances that never reached running to an error message
+        """
+        errors = {}
+        pending = self._filter_not_running(instance_ids)
+        waiter = self.ec2_client.get_waiter('instance_running')
+        
+        while pending:
+            self.logger.info(f"Waiting for {len(pending)} instances to be running...")
+            try:
+                for chunk in _chunked(pending):
+                    waiter.wait(InstanceIds=chunk, WaiterConfig=INSTANCE_WAITER_CONFIG)
+                break
+            except WaiterError as e:
+                # A single stopped instance fails the whole batch, so drop it and wait on the rest
+                states = self._get_instance_states(pending)
+                stopped = {
+                    instance_id: state for instance_id, state in states.items()
+                    if state in STOPPED_INSTANCE_STATES
+                }
+                if not stopped:
+                    # Timed out: only the instances that still aren't running have failed
+                    for instance_id in pending:
+                        if states.get(instance_id) != 'running':
+                            errors[instance_id] = str(e)
+                    break
                 
-                # Tag the spot instance (since TagSpecifications isn't supported in launch)
+                for instance_id, state in stopped.items():
+                    errors[instance_id] = f"Instance entered state '{state}' before running"
+                pending = [instance_id for instance_id in pending if instance_id not in stopped]
+        
+        return errors
+    
+    def _filter_not_running(self, instance_ids: List[str]) -> List[str]:
+        """Return the instances that aren't running yet, so running ones can skip the waiter."""
+        try:
+            instances = self._describe_instances(instance_ids)
+        except ClientError as e:
+            # Freshly launched instances may not be visible to DescribeInstances yet
+            if e.response.get('Error', {}).get('Code') != 'InvalidInstanceID.NotFound':
+                raise
+            return list(instance_ids)
+        
+        return [
+            instance_id for instance_id in instance_ids
+            if instances.get(instance_id, {}).get('State', {}).get('Name') != 'running'
+        ]
+    
+    def _describe_instances(self, instance_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Describe instances in bulk, returning each instance's description keyed by ID."""
+        instances = {}
+        for chunk in _chunked(instance_ids):
+            response = self.ec2_client.describe_instances(InstanceIds=chunk)
+            for reservation in response['Reservations']:
+                for instance in reservation['Instances']:
+                    instances[instance['InstanceId']] = instance
+        return instances
+    
+    def _describe_running_instances(self, instance_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe instances already confirmed running, tolerating a failed read.
+        
+        The instances are up either way, so a failed DescribeInstances call only costs
+        their details: the missing instances are left out of the returned dictionary.
+        """
+        try:
+            instances = self._describe_instances(instance_ids)
+        except Exception as e:
+            self.logger.warning(f"Failed to describe running instances: {e}")
+            return {}
+        
+        missing = [instance_id for instance_id in instance_ids if instance_id not in instances]
+        if missing:
+            self.logger.warning(f"Details of running instances {', '.join(missing)} could not be retrieved")
+        return instances
+    
+    def _get_instance_states(self, instance_ids: List[str]) -> Dict[str, str]:
+        """Return the current state name of each instance, keyed by ID."""
+        return {
+            instance_id: instance['State']['Name']
+            for instance_id, instance in self._describe_instances(instance_ids).items()
+        }
+    
+    def _tag_instances(self, launches: List[Dict[str, Any]], instances: Dict[str, Dict[str, Any]]):
+        """
+        Apply the tags that couldn't be set at launch to instances and their EBS volumes.
+        
+        Tags shared by a launch group are set by TagSpecifications, so only grouped
+        on-demand launches have deferred tags left, typically just their Name. Each
+        deferred tag is coalesced across every resource that needs it, and tags
+        needed by the same resources share one CreateTags call.
+        
+        Args:
+            launches: Launch records of instances that are running
+            instances: Instance descriptions keyed by instance ID
+        """
+        resources_by_tag = {}
+        
+        for launch in launches:
+            if not launch['deferred_tags']:
+                continue
+            instance = instances.get(launch['instance_id'], {})
+            resources = [launch['instance_id']] + [
+                mapping['Ebs']['VolumeId']
+                for mapping in instance.get('BlockDeviceMappings', [])
+                if 'Ebs' in mapping
+            ]
+            for tag in launch['deferred_tags']:
+                resources_by_tag.setdefault((tag['Key'], tag['Value']), []).extend(resources)
+        
+        tags_by_resources = {}
+        for tag, resources in resources_by_tag.items():
+            tags_by_resources.setdefault(tuple(resources), []).append(tag)
+        
+        for resources, tags in tags_by_resources.items():
+            for chunk in _chunked(list(resources)):
                 try:
                     self.ec2_client.create_tags(
-                        Resources=[instance_id],
-                        Tags=self._create_tags(config, instance_id)
+                        Resources=chunk,
+                        Tags=[{'Key': key, 'Value': value} for key, value in tags]
                     )
-                    self.logger.info(f"Successfully tagged spot instance {instance_id}")
                 except Exception as tag_error:
-                    self.logger.warning(f"Failed to tag spot instance {instance_id}: {tag_error}")
-                
-                self.logger.info(f"Spot instance {config.name} successfully provisioned on attempt {attempt + 1}")
-                return result
-                
-            except Exception as e:
-                error_msg = f"Spot instance attempt {attempt + 1} failed for {config.name}: {str(e)}"
-                self.logger.warning(error_msg)
-                
-                # Clean up failed spot request if it exists
-                if 'spot_request_id' in locals():
-                    try:
-                        self.logger.info(f"Cancelling failed spot request {spot_request_id}")
-                        self.ec2_client.cancel_spot_instance_requests(
-                            SpotInstanceRequestIds=[spot_request_id]
-                        )
-                    except Exception as cleanup_error:
-                        self.logger.warning(f"Failed to cancel spot request: {cleanup_error}")
-                
-                # If this was the last attempt, raise the error
-                if attempt == max_retries - 1:
-                    raise Exception(f"All {max_retries} spot instance attempts failed for {config.name}. Last error: {str(e)}")
-                
-                # Wait before retrying
-                self.logger.info(f"Waiting {retry_delay} seconds before retry...")
-                time.sleep(retry_delay)
-                
-                # Increase delay for next attempt (exponential backoff)
-                retry_delay = min(retry_delay * 2, 120)  # Cap at 2 minutes
-    
-    def _finalize_instance(self, config: EC2InstanceConfig, instance_id: str, instance_type: str) -> Dict[str, Any]:
-        """Finalize instance setup and return result."""
-        # Get instance details
-        instance = self.ec2_resource.Instance(instance_id)
-        
-        # Create and attach EBS volume tags
-        for volume in instance.volumes.all():
-            self.ec2_client.create_tags(
-                Resources=[volume.id],
-                Tags=self._create_tags(config, instance_id)
-            )
+                    self.logger.warning(f"Failed to tag resources {', '.join(chunk)}: {tag_error}")
+        
+        if tags_by_resources:
+            self.logger.info(f"Tagged {len(launches)} instances and their volumes")
+    
+    def _failed_launch_result(self, launch: Dict[str, Any], error: str) -> Dict[str, Any]:
+        """Build the failed result for an instance that launched but never came up."""
+        result = {
+            'name': launch['config'].name,
+            'instance_id': launch['instance_id'],
+            'status': 'failed',
+            'error': error
+        }
+        
+        if launch.get('spot_request_id'):
+            result['spot_request_id'] = launch['spot_request_id']
+        
+        return result
+    
+    def _terminate_failed_instances(self, instance_ids: List[str]):
+        """
+        Terminate instances confirmed stopped or stuck before running, one call per chunk of IDs.
+        
+        Terminating a one-time spot instance also closes its spot request, so
+        no separate cancel call is needed.
+        """
+        for chunk in _chunked(instance_ids):
+            try:
+                self.logger.info(f"Terminating {len(chunk)} failed instances")
+                self.ec2_client.terminate_instances(InstanceIds=chunk)
+            except Exception as cleanup_error:
+                self.logger.warning(f"Failed to terminate instances {', '.join(chunk)}: {cleanup_error}")
+    
+    def _finalize_instance(self, launch: Dict[str, Any], instance: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Finalize instance setup and return result built from its describe_instances entry.
+        
+        The instance is known to be running, so an empty entry from a failed describe
+        still gives a successful result, just without IP addresses.
+        """
+        config = launch['config']
+        instance_id = launch['instance_id']
+        instance_type = launch['instance_type']
         
         result = {
             'name': config.name,
             'instance_id': instance_id,
-            'public_ip': instance.public_ip_address,
-            'private_ip': instance.private_ip_address,
-            'state': instance.state['Name'],
+            'public_ip': instance.get('PublicIpAddress'),
+            'private_ip': instance.get('PrivateIpAddress'),
+            'state': instance.get('State', {}).get('Name', 'running'),
             'status': 'success',
             'instance_type': instance_type
         }
         
+        if instance_type == 'spot':
+            result['spot_request_id'] = launch['spot_request_id']
+        
         self.logger.info(f"Successfully provisioned {instance_type} instance {config.name} ({instance_id})")
         return result
     
@@ -310,75 +797,350 @@ class EC2Provisioner:
         
         Args:
             configs: List of EC2 instance configurations
-            
+        
         Returns:
             List of provisioning results
         """
+        return list(self.iter_provision_instances(configs))
+    
+    def iter_provision_instances(self, configs: List[EC2InstanceConfig]) -> Iterator[Dict[str, Any]]:
+        """
+        Provision multiple EC2 instances in parallel, yielding each result as soon as it is known.
+        
+        Launch requests are submitted in parallel first, with identical on-demand
+        configs sharing one run_instances call, then a single batched waiter
+        polls every launched instance before the instances are finalized.
+        
+        Args:
+            configs: List of EC2 instance configurations
+        
+        Yields:
+            Provisioning result for each config
+        """
         self.logger.info(f"Starting parallel provisioning of {len(configs)} instances")
         
-        results = []
+        successful = failed = 0
+        for result in self._provision_results(configs):
+            if result['status'] == 'success':
+                successful += 1
+            else:
+                failed += 1
+            yield result
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all provisioning tasks
-            future_to_config = {
-                executor.submit(self.provision_instance, config): config 
-                for config in configs
-            }
-            
-            # Process completed tasks
-            for future in as_completed(future_to_config):
-                config = future_to_config[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    if result['status'] == 'success':
-                        self.logger.info(f"Instance {config.name} completed successfully")
-                    else:
-                        self.logger.error(f"Instance {config.name} failed: {result.get('error', 'Unknown error')}")
-                        
-                except Exception as e:
-                    error_result = {
+        self.logger.info(f"Provisioning completed. Successful: {successful}, Failed: {failed}")
+    
+    def _provision_results(self, configs: List[EC2InstanceConfig]) -> Iterator[Dict[str, Any]]:
+        """Launch, wait for, tag and finalize instances, yielding results in completion order."""
+        launches = []
+        
+        # Set default values up front so failed results still carry the generated name
+        configs, failures = self._apply_defaults(configs)
+        yield from failures
+        
+        # Submit one launch request per group of identical configs, all sharing the run's base tags
+        base_tags = self._create_base_tags()
+        future_to_group = {
+            self._executor.submit(self._submit_launch_group, group, base_tags): group
+            for group in self._group_configs(configs)
+        }
+        
+        for future in as_completed(future_to_group):
+            try:
+                group_launches = future.result()
+            except Exception as e:
+                for config in future_to_group[future]:
+                    result = {
                         'name': config.name,
                         'status': 'failed',
                         'error': str(e)
                     }
-                    results.append(error_result)
-                    self.logger.error(f"Unexpected error provisioning {config.name}: {e}")
+                    self.logger.error(f"Instance {config.name} failed: {e}")
+                    yield result
+                continue
+            
+            for launch in group_launches:
+                if 'error' in launch:
+                    config = launch['config']
+                    result = {
+                        'name': config.name,
+                        'status': 'failed',
+                        'error': launch['error']
+                    }
+                    self.logger.error(f"Instance {config.name} failed: {launch['error']}")
+                    yield result
+                else:
+                    launches.append(launch)
+        
+        # Wait for every launched instance with one waiter
+        wait_errors = {}
+        if launches:
+            instance_ids = [launch['instance_id'] for launch in launches]
+            try:
+                wait_errors = self._wait_for_running(instance_ids)
+            except Exception as e:
+                self.logger.error(f"Failed waiting for instances to be running: {e}")
+                wait_errors = dict.fromkeys(instance_ids, str(e))
+            else:
+                # Every instance reported by the waiter was seen stopped or still not running,
+                # so terminate those in one call; instances whose state is unknown are left to --cleanup
+                if wait_errors:
+                    self._terminate_failed_instances(list(wait_errors))
+        
+        running = []
+        for launch in launches:
+            config = launch['config']
+            error = wait_errors.get(launch['instance_id'])
+            if error:
+                result = self._failed_launch_result(launch, error)
+                self.logger.error(f"Instance {config.name} failed: {error}")
+                yield result
+            else:
+                running.append(launch)
+        
+        # Describe all running instances in one pass for tagging and results
+        instances = {}
+        if running:
+            instances = self._describe_running_instances([launch['instance_id'] for launch in running])
+        
+        # Apply the tags deferred from grouped launches in bulk
+        if running:
+            try:
+                self._tag_instances(running, instances)
+            except Exception as e:
+                self.logger.warning(f"Failed to tag provisioned instances: {e}")
+        
+        # Finalize the running instances
+        for launch in running:
+            result = self._finalize_instance(launch, instances.get(launch['instance_id'], {}))
+            self.logger.info(f"Instance {launch['config'].name} completed successfully")
+            yield result
+    
+    async def provision_instances_async(self, configs: List[EC2InstanceConfig]) -> List[Dict[str, Any]]:
+        """
+        Provision multiple EC2 instances concurrently on a single event loop.
+        
+        Every launch and waiter is a coroutine sharing one aioboto3 client, so the number
+        of in-flight instances is not capped by max_workers. Requires the optional
+        aioboto3 dependency.
+        
+        Args:
+            configs: List of EC2 instance configurations
+        
+        Returns:
+            List of provisioning results
+        """
+        if aioboto3 is None:
+            raise ImportError("aioboto3 is required for async provisioning: pip install aioboto3")
+        
+        self.logger.info(f"Starting async provisioning of {len(configs)} instances")
+        
+        # Defaults and credentials need blocking boto3 calls, so resolve them once in the worker pool
+        loop = asyncio.get_running_loop()
+        configs, failures = await loop.run_in_executor(self._executor, self._apply_defaults, configs)
+        session = await loop.run_in_executor(self._executor, _get_async_session, self.region_name)
+        
+        base_tags = self._create_base_tags()
+        stuck_instance_ids = []
+        async with session.client('ec2', config=_boto_config(ASYNC_MAX_POOL_CONNECTIONS)) as ec2_client:
+            results = await asyncio.gather(
+                *(
+                    self._provision_instance_async(ec2_client, config, base_tags, stuck_instance_ids)
+                    for config in configs
+                )
+            )
+        results = failures + list(results)
+        
+        # Terminate the instances confirmed stopped or stuck before running in one call
+        if stuck_instance_ids:
+            await loop.run_in_executor(self._executor, self._terminate_failed_instances, stuck_instance_ids)
         
         # Log summary
-        successful = len([r for r in results if r['status'] == 'success'])
-        failed = len([r for r in results if r['status'] == 'failed'])
+        successful = failed = 0
+        for result in results:
+            if result['status'] == 'success':
+                successful += 1
+            else:
+                failed += 1
         
         self.logger.info(f"Provisioning completed. Successful: {successful}, Failed: {failed}")
         
         return results
     
+    async def provision_instance_async(self, config: EC2InstanceConfig) -> Dict[str, Any]:
+        """
+        Provision a single EC2 instance (on-demand or spot) with aioboto3.
+        
+        Args:
+            config: EC2 instance configuration
+        
+        Returns:
+            Dictionary containing instance information and status
+        """
+        results = await self.provision_instances_async([config])
+        return results[0]
+    
+    async def _provision_instance_async(self, ec2_client, config: EC2InstanceConfig,
+                                        base_tags: List[Dict[str, str]],
+                                        stuck_instance_ids: List[str]) -> Dict[str, Any]:
+        """
+        Launch, wait for and describe one instance with defaults applied, using an aioboto3 EC2 client.
+        
+        The instance ID is added to stuck_instance_ids when the waiter gives up and the
+        instance is confirmed stopped or still not running, so the caller can terminate it.
+        """
+        try:
+            self.logger.info(f"Starting provisioning for instance: {config.name}")
+            
+            # Build launch parameters and tags once for the launch and retries
+            launch_params = self._build_launch_params(config)
+            tags = self._create_tags(config, base_tags)
+            if config.spot_instance:
+                instance_type = 'spot'
+                instance = await self._launch_spot_instance_async(
+                    ec2_client, config, self._build_spot_params(config, launch_params, tags)
+                )
+            else:
+                instance_type = 'on-demand'
+                response = await self._run_instances_async(
+                    ec2_client, **self._build_on_demand_params(launch_params, 1, tags)
+                )
+                instance = response['Instances'][0]
+            
+            instance_id = instance['InstanceId']
+        
+        except Exception as e:
+            error_msg = f"Failed to provision instance {config.name}: {str(e)}"
+            self.logger.error(error_msg)
+            return {
+                'name': config.name,
+                'status': 'failed',
+                'error': str(e)
+            }
+        
+        # Keep the instance ID in every result from here on so --cleanup can terminate it
+        launch = {
+            'config': config,
+            'instance_id': instance_id,
+            'instance_type': instance_type,
+            'spot_request_id': instance.get('SpotInstanceRequestId')
+        }
+        
+        try:
+            # Get instance details, waiting for instance to be running unless it already is
+            instance = await self._describe_instance_async(ec2_client, instance_id)
+            if instance is None or instance['State']['Name'] != 'running':
+                self.logger.info(f"Waiting for instance {instance_id} to be running...")
+                waiter = ec2_client.get_waiter('instance_running')
+                try:
+                    await waiter.wait(InstanceIds=[instance_id], WaiterConfig=INSTANCE_WAITER_CONFIG)
+                except WaiterError:
+                    # Only give up on an instance whose state confirms it didn't come up
+                    instance = await self._describe_instance_async(ec2_client, instance_id)
+                    if instance is None or instance['State']['Name'] != 'running':
+                        if instance is not None:
+                            stuck_instance_ids.append(instance_id)
+                        raise
+                else:
+                    # The waiter confirmed the instance is running, so a failed read only loses its details
+                    try:
+                        instance = await self._describe_instance_async(ec2_client, instance_id)
+                    except Exception as e:
+                        self.logger.warning(f"Failed to describe running instance {instance_id}: {e}")
+                        instance = None
+            
+            if instance is None:
+                self.logger.warning(f"Details of running instance {instance_id} could not be retrieved")
+                instance = {}
+            
+            # The instance and its EBS volumes were tagged at launch
+            return self._finalize_instance(launch, instance)
+        
+        except Exception as e:
+            self.logger.error(f"Failed to provision instance {config.name}: {str(e)}")
+            return self._failed_launch_result(launch, str(e))
+    
+    async def _describe_instance_async(self, ec2_client, instance_id: str) -> Optional[Dict[str, Any]]:
+        """Describe one instance, returning None if it isn't visible to DescribeInstances yet."""
+        try:
+            response = await ec2_client.describe_instances(InstanceIds=[instance_id])
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'InvalidInstanceID.NotFound':
+                raise
+            return None
+        return response['Reservations'][0]['Instances'][0]
+    
+    async def _launch_spot_instance_async(self, ec2_client, config: EC2InstanceConfig,
+                                          spot_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Launch a spot EC2 instance with retry logic, returning the launched instance."""
+        max_retries = _spot_attempts(config)
+        
+        for attempt in range(max_retries):
+            try:
+                self.logger.info(f"Spot instance attempt {attempt + 1}/{max_retries} for {config.name}")
+                response = await self._run_instances_async(ec2_client, **spot_params)
+                return response['Instances'][0]
+            
+            except Exception as e:
+                # Wait before retrying without blocking the other launches
+                await asyncio.sleep(self._spot_retry_delay(config, attempt, e))
+    
+    def _apply_defaults(self, configs: List[EC2InstanceConfig]) -> Tuple[List[EC2InstanceConfig], List[Dict[str, Any]]]:
+        """
+        Set default values on every config, looking up the default AMI at most once.
+        
+        Args:
+            configs: List of EC2 instance configurations
+        
+        Returns:
+            Tuple of the defaulted configs and failed results for the configs that couldn't be defaulted
+        """
+        # lru_cache doesn't cache failures, so a failed lookup would otherwise be retried for every config
+        ami_error = None
+        if any(not config.image_id for config in configs):
+            try:
+                _resolve_default_ami(self.region_name)
+            except Exception as e:
+                ami_error = e
+        
+        defaulted_configs = []
+        failures = []
+        for config in configs:
+            try:
+                if ami_error is not None and not config.image_id:
+                    raise ami_error
+                defaulted_configs.append(self._set_defaults(config))
+            except Exception as e:
+                failures.append({
+                    'name': config.name,
+                    'status': 'failed',
+                    'error': str(e)
+                })
+                self.logger.error(f"Failed to provision instance {config.name}: {e}")
+        
+        return defaulted_configs, failures
+    
     def _set_defaults(self, config: EC2InstanceConfig) -> EC2InstanceConfig:
         """Set default values for missing configuration fields."""
-        import copy
-        
-        # Create a copy to avoid modifying the original
-        config = copy.deepcopy(config)
+        updates = {}
         
         # Set default name if not provided
         if not config.name:
-            config.name = f"{config.instance_type}-{int(time.time())}"
+            updates['name'] = f"{config.instance_type}-{int(time.time())}"
         
-        # Set default Ubuntu 24.04 LTS AMI if not provided
+        # Set default Ubuntu 24.04 LTS AMI for this region if not provided
         if not config.image_id:
-            # This is a placeholder - you'll need to update this with a valid AMI for your region
-            config.image_id = "ami-0ae8595e2aff47037"  # Ubuntu 24.04 LTS in us-east-1
+            updates['image_id'] = _resolve_default_ami(self.region_name)
         
         # Set default tags if not provided
         if not config.tags:
-            config.tags = {
+            updates['tags'] = {
                 "Environment": "Development",
                 "Project": "AutoProvisioned",
                 "InstanceType": "Spot" if config.spot_instance else "OnDemand"
             }
         
-        return config
+        # Return a copy to avoid modifying the original
+        return replace(config, **updates)
     
     def terminate_instance(self, instance_id: str) -> bool:
         """
@@ -411,20 +1173,19 @@ class EC2Provisioner:
         self.logger.info(f"Starting cleanup of {len(instance_ids)} instances")
         
         results = {}
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_id = {
-                executor.submit(self.terminate_instance, instance_id): instance_id 
-                for instance_id in instance_ids
-            }
-            
-            for future in as_completed(future_to_id):
-                instance_id = future_to_id[future]
-                try:
-                    success = future.result()
-                    results[instance_id] = success
-                except Exception as e:
-                    self.logger.error(f"Error during cleanup of {instance_id}: {e}")
-                    results[instance_id] = False
+        future_to_id = {
+            self._executor.submit(self.terminate_instance, instance_id): instance_id 
+            for instance_id in instance_ids
+        }
+        
+        for future in as_completed(future_to_id):
+            instance_id = future_to_id[future]
+            try:
+                success = future.result()
+                results[instance_id] = success
+            except Exception as e:
+                self.logger.error(f"Error during cleanup of {instance_id}: {e}")
+                results[instance_id] = False
         
         return results
     
@@ -469,52 +1230,58 @@ def load_user_data_from_file(file_path: str, params: dict = None) -> str:
 def load_config_from_file(config_file: str) -> List[EC2InstanceConfig]:
     """Load EC2 instance configurations from a JSON file."""
     try:
-        with open(config_file, 'r') as f:
-            config_data = json.load(f)
+        if orjson is not None:
+            with open(config_file, 'rb') as f:
+                config_data = orjson.loads(f.read())
+        else:
+            with open(config_file, 'r') as f:
+                config_data = json.load(f)
         
         configs = []
         for item in config_data:
+            kwargs = {key: value for key, value in item.items() if key in _CONFIG_FIELDS}
+            
             # Handle user_data vs user_data_file
-            user_data = None
             if item.get('user_data_file'):
                 # Extract parameters for YAML substitution
-                params = {}
-                for key, value in item.items():
-                    if key not in ['instance_type', 'name', 'image_id', 'key_name', 'security_group_ids', 
-                                 'subnet_id', 'user_data', 'user_data_file', 'tags', 'volume_size', 
-                                 'volume_type', 'iam_instance_profile', 'spot_instance', 'spot_max_price',
-                                 'spot_max_retries', 'spot_retry_delay']:
-                        params[key] = value
-                
-                user_data = load_user_data_from_file(item['user_data_file'], params)
-            elif item.get('user_data'):
-                user_data = item['user_data']
+                params = {key: value for key, value in item.items() if key not in _CONFIG_FIELDS}
+                kwargs['user_data'] = load_user_data_from_file(item['user_data_file'], params)
             
-            config = EC2InstanceConfig(
-                instance_type=item['instance_type'],
-                name=item.get('name'),
-                image_id=item.get('image_id'),
-                key_name=item.get('key_name'),
-                security_group_ids=item.get('security_group_ids'),
-                subnet_id=item.get('subnet_id'),
-                user_data=user_data,  # Use processed user_data
-                user_data_file=item.get('user_data_file'),
-                tags=item.get('tags'),
-                volume_size=item.get('volume_size', 8),
-                volume_type=item.get('volume_type', 'gp3'),
-                iam_instance_profile=item.get('iam_instance_profile'),
-                spot_instance=item.get('spot_instance', True),
-                spot_max_price=item.get('spot_max_price'),
-                spot_max_retries=item.get('spot_max_retries', 3),
-                spot_retry_delay=item.get('spot_retry_delay', 30)
-            )
-            configs.append(config)
+            configs.append(EC2InstanceConfig(**kwargs))
         
         return configs
     except Exception as e:
         raise Exception(f"Failed to load configuration from {config_file}: {e}")
 
 
+def stream_results_to_file(results: Iterable[Dict[str, Any]], file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Write provisioning results to a JSON array file as they arrive.
+    
+    The closing bracket is written even if provisioning is interrupted, so the
+    file always holds valid JSON for a later --cleanup run.
+    
+    Args:
+        results: Provisioning results, typically from iter_provision_instances
+        file_path: Path of the JSON file to write
+    
+    Yields:
+        Each result after it has been written
+    """
+    with open(file_path, 'w') as f:
+        f.write('[')
+        first = True
+        try:
+            for result in results:
+                f.write('\n' if first else ',\n')
+                f.write(textwrap.indent(json.dumps(result, indent=2), '  '))
+                f.flush()
+                first = False
+                yield result
+        finally:
+            f.write(']' if first else '\n]')
+
+
 def create_sample_config():
     """Create a sample configuration file."""
     sample_config = [
@@ -553,6 +1320,9 @@ def main():
     parser.add_argument('--workers', '-w', type=int, default=5, help='Maximum parallel workers (default: 5)')
     parser.add_argument('--cleanup', action='store_true', help='Clean up instances from previous run (no provisioning)')
     parser.add_argument('--sample', action='store_true', help='Create sample configuration file')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Provision on a single asyncio event loop (requires aioboto3)')
+    parser.add_argument('--validate', action='store_true', help='Check AWS credentials before provisioning')
     
     args = parser.parse_args()
     
@@ -568,18 +1338,18 @@ def main():
                 with open('provisioning_results.json', 'r') as f:
                     previous_results = json.load(f)
                 
-                provisioner = EC2Provisioner(region_name=args.region, max_workers=args.workers)
-                
-                print("Cleaning up instances from previous run...")
-                instance_ids = [r['instance_id'] for r in previous_results if r['status'] == 'success']
-                
-                if instance_ids:
-                    cleanup_results = provisioner.cleanup_instances(instance_ids)
-                    for instance_id, success in cleanup_results.items():
-                        status = "✅" if success else "❌"
-                        print(f"{status} {instance_id}")
-                else:
-                    print("No instances to clean up")
+                with EC2Provisioner(region_name=args.region, max_workers=args.workers) as provisioner:
+                    print("Cleaning up instances from previous run...")
+                    # Failed results keep the ID of any instance that launched, so terminate those too
+                    instance_ids = [r['instance_id'] for r in previous_results if r.get('instance_id')]
+                    
+                    if instance_ids:
+                        cleanup_results = provisioner.cleanup_instances(instance_ids)
+                        for instance_id, success in cleanup_results.items():
+                            status = "✅" if success else "❌"
+                            print(f"{status} {instance_id}")
+                    else:
+                        print("No instances to clean up")
             else:
                 print("No previous provisioning results found")
         except Exception as e:
@@ -597,27 +1367,24 @@ def main():
         configs = load_config_from_file(args.config)
         
         # Initialize provisioner
-        provisioner = EC2Provisioner(region_name=args.region, max_workers=args.workers)
-        
-        # Provision instances
-        results = provisioner.provision_instances_parallel(configs)
-        
-        # Print results
-        print("\n" + "="*60)
-        print("PROVISIONING RESULTS")
-        print("="*60)
-        
-        for result in results:
-            if result['status'] == 'success':
-                print(f"✅ {result['name']}: {result['instance_id']} ({result['public_ip']})")
+        with EC2Provisioner(region_name=args.region, max_workers=args.workers, validate=args.validate) as provisioner:
+            # Provision instances
+            if args.use_async:
+                results = asyncio.run(provisioner.provision_instances_async(configs))
             else:
-                print(f"❌ {result['name']}: {result.get('error', 'Unknown error')}")
-        
-
-        
-        # Save results to file
-        with open('provisioning_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+                results = provisioner.iter_provision_instances(configs)
+            
+            # Print results
+            print("\n" + "="*60)
+            print("PROVISIONING RESULTS")
+            print("="*60)
+            
+            # Save each result to file as it arrives
+            for result in stream_results_to_file(results, 'provisioning_results.json'):
+                if result['status'] == 'success':
+                    print(f"✅ {result['name']}: {result['instance_id']} ({result['public_ip']})")
+                else:
+                    print(f"❌ {result['name']}: {result.get('error', 'Unknown error')}")
         
         print(f"\nResults saved to 'provisioning_results.json'")
         
@@ -0,0 +1,472 @@
+"""Tests for aws_ec2_provisioning using a stubbed EC2 client."""
+
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from botocore.exceptions import ClientError, WaiterError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import aws_ec2_provisioning as provisioning
+from aws_ec2_provisioning import EC2InstanceConfig, EC2Provisioner
+
+
+class FakeWaiter:
+    """instance_running waiter that applies the next state transition, then times out if anything isn't running."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def wait(self, InstanceIds, WaiterConfig):
+        if self.client.transitions:
+            self.client.states.update(self.client.transitions.pop(0))
+        if any(self.client.states[instance_id] != 'running' for instance_id in InstanceIds):
+            raise WaiterError('InstanceRunning', 'Max attempts exceeded', {})
+
+
+class FakeEC2Client:
+    """Minimal stand-in for the boto3 EC2 client, recording the calls made to it."""
+
+    def __init__(self, states=None, transitions=None, launch_count=None, run_error=None,
+                 run_errors=None, launch_state='running'):
+        self.states = dict(states or {})
+        self.transitions = list(transitions or [])
+        self.launch_count = launch_count
+        self.run_error = run_error
+        self.run_errors = list(run_errors or [])
+        self.launch_state = launch_state
+        self.run_calls = []
+        self.create_tags_calls = []
+        self.terminated = []
+
+    def run_instances(self, **params):
+        self.run_calls.append(params)
+        if self.run_error is not None:
+            raise self.run_error
+        if self.run_errors:
+            raise self.run_errors.pop(0)
+        count = params['MaxCount'] if self.launch_count is None else self.launch_count
+        instances = []
+        for index in range(count):
+            instance_id = f"i-{len(self.states):04d}"
+            self.states[instance_id] = self.launch_state
+            instances.append({'InstanceId': instance_id, 'AmiLaunchIndex': index})
+        # Responses don't promise launch index order
+        return {'Instances': list(reversed(instances))}
+
+    def describe_instances(self, InstanceIds):
+        return {
+            'Reservations': [{
+                'Instances': [
+                    {
+                        'InstanceId': instance_id,
+                        'State': {'Name': self.states[instance_id]},
+                        'BlockDeviceMappings': [{'Ebs': {'VolumeId': f"vol-{instance_id}"}}]
+                    }
+                    for instance_id in InstanceIds if instance_id in self.states
+                ]
+            }]
+        }
+
+    def get_waiter(self, name):
+        return FakeWaiter(self)
+
+    def create_tags(self, Resources, Tags):
+        self.create_tags_calls.append((list(Resources), list(Tags)))
+
+    def terminate_instances(self, InstanceIds):
+        self.terminated.extend(InstanceIds)
+
+
+class FakeAsyncWaiter(FakeWaiter):
+    """Awaitable version of FakeWaiter, as returned by aioboto3 clients."""
+
+    async def wait(self, InstanceIds, WaiterConfig):
+        super().wait(InstanceIds, WaiterConfig)
+
+
+class FakeAsyncEC2Client:
+    """aioboto3-style client that forwards to a FakeEC2Client, so both paths share its state."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def run_instances(self, **params):
+        return self.client.run_instances(**params)
+
+    async def describe_instances(self, InstanceIds):
+        return self.client.describe_instances(InstanceIds)
+
+    def get_waiter(self, name):
+        return FakeAsyncWaiter(self.client)
+
+
+class FakeAsyncSession:
+    """aioboto3 session whose clients all forward to one FakeEC2Client."""
+
+    def __init__(self, ec2_client):
+        self.ec2_client = ec2_client
+
+    def client(self, service_name, config=None):
+        return FakeAsyncEC2Client(self.ec2_client)
+
+
+@pytest.fixture
+def provisioner(tmp_path, monkeypatch):
+    # Keep the log file out of the repo and never reach for real credentials
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_EC2_METADATA_DISABLED', 'true')
+    with EC2Provisioner(region_name='us-east-1', max_workers=2) as provisioner:
+        yield provisioner
+
+
+def _config(name, **kwargs):
+    kwargs.setdefault('instance_type', 't3.micro')
+    kwargs.setdefault('image_id', 'ami-12345678')
+    kwargs.setdefault('tags', {'Project': 'Test'})
+    return EC2InstanceConfig(name=name, **kwargs)
+
+
+def test_wait_for_running_fails_only_instances_not_running_on_timeout(provisioner):
+    client = FakeEC2Client(
+        states={'i-a': 'pending', 'i-b': 'pending'},
+        transitions=[{'i-a': 'running'}]
+    )
+    provisioner.ec2_client = client
+
+    errors = provisioner._wait_for_running(['i-a', 'i-b'])
+
+    assert list(errors) == ['i-b']
+
+
+def test_wait_for_running_drops_stopped_instances_and_waits_on_the_rest(provisioner):
+    client = FakeEC2Client(
+        states={'i-a': 'pending', 'i-b': 'pending'},
+        transitions=[{'i-a': 'terminated'}, {'i-b': 'running'}]
+    )
+    provisioner.ec2_client = client
+
+    errors = provisioner._wait_for_running(['i-a', 'i-b'])
+
+    assert errors == {'i-a': "Instance entered state 'terminated' before running"}
+
+
+def test_group_configs_batches_identical_on_demand_configs_only(provisioner):
+    web_1 = _config('web-1', spot_instance=False)
+    web_2 = _config('web-2', spot_instance=False)
+    large = _config('large', spot_instance=False, instance_type='t3.large')
+    spot_1 = _config('spot-1')
+    spot_2 = _config('spot-2')
+
+    groups = provisioner._group_configs([web_1, spot_1, large, web_2, spot_2])
+
+    assert groups == [[web_1, web_2], [spot_1], [large], [spot_2]]
+
+
+def test_grouped_on_demand_launch_matches_instances_by_launch_index(provisioner):
+    client = FakeEC2Client()
+    provisioner.ec2_client = client
+    configs = [_config(f"web-{index}", spot_instance=False) for index in range(3)]
+
+    results = provisioner.provision_instances_parallel(configs)
+
+    assert client.run_calls[0]['MinCount'] == 1
+    assert client.run_calls[0]['MaxCount'] == 3
+    assert sorted((result['name'], result['instance_id']) for result in results) == [
+        ('web-0', 'i-0000'), ('web-1', 'i-0001'), ('web-2', 'i-0002')
+    ]
+    # Shared tags go on at launch; only the names are applied afterwards, one call per instance
+    assert sorted(client.create_tags_calls) == [
+        (['i-0000', 'vol-i-0000'], [{'Key': 'Name', 'Value': 'web-0'}]),
+        (['i-0001', 'vol-i-0001'], [{'Key': 'Name', 'Value': 'web-1'}]),
+        (['i-0002', 'vol-i-0002'], [{'Key': 'Name', 'Value': 'web-2'}])
+    ]
+
+
+def test_grouped_on_demand_capacity_shortfall_fails_only_missing_configs(provisioner):
+    client = FakeEC2Client(launch_count=1)
+    provisioner.ec2_client = client
+    configs = [_config('web-0', spot_instance=False), _config('web-1', spot_instance=False)]
+
+    results = {result['name']: result for result in provisioner.provision_instances_parallel(configs)}
+
+    assert results['web-0']['status'] == 'success'
+    assert results['web-1']['status'] == 'failed'
+    assert 'instance_id' not in results['web-1']
+
+
+def test_spot_launch_with_zero_retries_fails_only_its_instance(provisioner):
+    error = ClientError({'Error': {'Code': 'InsufficientInstanceCapacity'}}, 'RunInstances')
+    client = FakeEC2Client(run_error=error)
+    provisioner.ec2_client = client
+
+    results = provisioner.provision_instances_parallel([_config('spot', spot_max_retries=0)])
+
+    assert len(client.run_calls) == 1
+    assert [result['status'] for result in results] == ['failed']
+
+
+def test_failed_launched_instances_are_terminated(provisioner):
+    client = FakeEC2Client(transitions=[{'i-0000': 'pending'}])
+    provisioner.ec2_client = client
+    provisioner._filter_not_running = lambda instance_ids: list(instance_ids)
+
+    results = provisioner.provision_instances_parallel([_config('spot')])
+
+    assert results[0]['status'] == 'failed'
+    assert results[0]['instance_id'] == 'i-0000'
+    assert client.terminated == ['i-0000']
+
+
+def test_instances_with_unknown_state_are_not_terminated(provisioner):
+    client = FakeEC2Client()
+    provisioner.ec2_client = client
+
+    def fail_wait(instance_ids):
+        raise ClientError({'Error': {'Code': 'RequestLimitExceeded'}}, 'DescribeInstances')
+
+    provisioner._wait_for_running = fail_wait
+    configs = [_config(f"web-{index}", spot_instance=False) for index in range(3)]
+
+    results = provisioner.provision_instances_parallel(configs)
+
+    assert [result['status'] for result in results] == ['failed'] * 3
+    assert all(result['instance_id'] for result in results)
+    assert client.terminated == []
+
+
+def test_failed_describe_of_running_instances_still_reports_success(provisioner):
+    client = FakeEC2Client()
+    provisioner.ec2_client = client
+    describe_instances = client.describe_instances
+    calls = []
+
+    def describe_once(InstanceIds):
+        # The waiter's running check succeeds; the bulk describe for results hits a throttle
+        calls.append(InstanceIds)
+        if len(calls) > 1:
+            raise ClientError({'Error': {'Code': 'RequestLimitExceeded'}}, 'DescribeInstances')
+        return describe_instances(InstanceIds)
+
+    client.describe_instances = describe_once
+    configs = [_config(f"web-{index}", spot_instance=False) for index in range(3)]
+
+    results = provisioner.provision_instances_parallel(configs)
+
+    assert [result['status'] for result in results] == ['success'] * 3
+    assert [result['public_ip'] for result in results] == [None] * 3
+    assert client.terminated == []
+
+
+def test_queued_log_records_are_written_when_a_library_user_exits(tmp_path):
+    script = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r})
+        from aws_ec2_provisioning import EC2Provisioner
+        provisioner = EC2Provisioner()
+        for index in range(20000):
+            provisioner.logger.info('line %d', index)
+    """)
+    env = dict(os.environ, AWS_ACCESS_KEY_ID='testing', AWS_SECRET_ACCESS_KEY='testing',
+               AWS_EC2_METADATA_DISABLED='true')
+
+    subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    with open(tmp_path / 'ec2_provisioning.log') as f:
+        assert sum(1 for _ in f) == 20000
+
+
+def test_existing_logging_configuration_is_left_alone(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(provisioning, '_log_listener', None)
+    handler = logging.NullHandler()
+    logging.getLogger().addHandler(handler)
+    try:
+        with EC2Provisioner(region_name='us-east-1'):
+            pass
+    finally:
+        logging.getLogger().removeHandler(handler)
+
+    assert provisioning._log_listener is None
+    assert not (tmp_path / 'ec2_provisioning.log').exists()
+
+
+@pytest.mark.parametrize('results', [
+    [],
+    [{'name': 'web-1', 'status': 'success', 'instance_id': 'i-1', 'public_ip': None}],
+    [
+        {'name': 'web-1', 'status': 'success', 'instance_id': 'i-1', 'public_ip': '1.2.3.4'},
+        {'name': 'web-2', 'status': 'failed', 'error': 'Nested\n"quotes"', 'details': {'codes': [1, 2]}}
+    ]
+])
+def test_stream_results_to_file_matches_json_dump(tmp_path, results):
+    file_path = tmp_path / 'results.json'
+
+    streamed = list(provisioning.stream_results_to_file(results, str(file_path)))
+
+    assert streamed == results
+    assert file_path.read_text() == json.dumps(results, indent=2)
+
+
+requires_aioboto3 = pytest.mark.skipif(provisioning.aioboto3 is None, reason='aioboto3 is not installed')
+
+
+@pytest.fixture
+def async_client(provisioner, monkeypatch):
+    def use_client(client):
+        # Termination goes through the shared sync client, so both see the same fake
+        provisioner.ec2_client = client
+        monkeypatch.setattr(provisioning, '_get_async_session', lambda region_name: FakeAsyncSession(client))
+        return client
+    return use_client
+
+
+@requires_aioboto3
+def test_async_spot_launch_succeeds_after_a_retry(provisioner, async_client):
+    error = ClientError({'Error': {'Code': 'InsufficientInstanceCapacity'}}, 'RunInstances')
+    client = async_client(FakeEC2Client(run_errors=[error]))
+
+    results = asyncio.run(provisioner.provision_instances_async([_config('spot', spot_retry_delay=0)]))
+
+    assert len(client.run_calls) == 2
+    assert results[0]['status'] == 'success'
+    assert results[0]['instance_id'] == 'i-0000'
+
+
+@requires_aioboto3
+def test_async_waiter_failure_keeps_instance_id_and_terminates_stuck_instance(provisioner, async_client):
+    client = async_client(FakeEC2Client(launch_state='pending'))
+
+    results = asyncio.run(provisioner.provision_instances_async([_config('spot')]))
+
+    assert results[0]['status'] == 'failed'
+    assert results[0]['instance_id'] == 'i-0000'
+    assert client.terminated == ['i-0000']
+
+
+@requires_aioboto3
+def test_async_results_include_configs_that_failed_defaults(provisioner, async_client, monkeypatch):
+    async_client(FakeEC2Client())
+
+    def fail_lookup(region_name):
+        raise ClientError({'Error': {'Code': 'AccessDeniedException'}}, 'GetParameter')
+
+    monkeypatch.setattr(provisioning, '_resolve_default_ami', fail_lookup)
+    configs = [_config('no-ami', image_id=None), _config('with-ami')]
+
+    results = asyncio.run(provisioner.provision_instances_async(configs))
+
+    assert [(result['name'], result['status']) for result in results] == [
+        ('no-ami', 'failed'), ('with-ami', 'success')
+    ]
+
+
+@pytest.mark.parametrize('error, retryable', [
+    (ClientError({'Error': {'Code': 'InsufficientInstanceCapacity'}}, 'RunInstances'), True),
+    (ClientError({'Error': {'Code': 'InvalidAMIID.NotFound'}}, 'RunInstances'), False),
+    (ClientError({'Error': {'Code': 'ExpiredToken'}}, 'RunInstances'), False),
+    (provisioning.NoCredentialsError(), False),
+    (ConnectionError('connection reset'), True)
+])
+def test_is_retryable_error(error, retryable):
+    assert provisioning._is_retryable_error(error) is retryable
+
+
+def test_non_retryable_spot_error_makes_a_single_launch_call(provisioner):
+    error = ClientError({'Error': {'Code': 'InvalidParameterValue'}}, 'RunInstances')
+    client = FakeEC2Client(run_error=error)
+    provisioner.ec2_client = client
+
+    results = provisioner.provision_instances_parallel([_config('spot', spot_max_retries=3)])
+
+    assert len(client.run_calls) == 1
+    assert 'non-retryable' in results[0]['error']
+
+
+def test_apply_defaults_looks_up_a_failing_default_ami_once(provisioner, monkeypatch):
+    calls = []
+
+    def fail_lookup(region_name):
+        calls.append(region_name)
+        raise ClientError({'Error': {'Code': 'AccessDeniedException'}}, 'GetParameter')
+
+    monkeypatch.setattr(provisioning, '_resolve_default_ami', fail_lookup)
+    configs = [_config('no-ami-1', image_id=None), _config('with-ami'), _config('no-ami-2', image_id=None)]
+
+    defaulted, failures = provisioner._apply_defaults(configs)
+
+    assert calls == ['us-east-1']
+    assert [config.name for config in defaulted] == ['with-ami']
+    assert [failure['name'] for failure in failures] == ['no-ami-1', 'no-ami-2']
+
+
+def test_default_ami_is_resolved_from_ssm_once_per_region(provisioner, monkeypatch):
+    requested = []
+
+    class FakeSSMClient:
+        def get_parameter(self, Name):
+            requested.append(Name)
+            return {'Parameter': {'Value': 'ami-default'}}
+
+    class FakeSession:
+        def client(self, service_name):
+            return FakeSSMClient()
+
+    monkeypatch.setattr(provisioning, '_get_session', lambda region_name: FakeSession())
+    provisioning._resolve_default_ami.cache_clear()
+    try:
+        configs = [_config(f"web-{index}", image_id=None) for index in range(3)]
+        defaulted, failures = provisioner._apply_defaults(configs)
+    finally:
+        provisioning._resolve_default_ami.cache_clear()
+
+    assert failures == []
+    assert [config.image_id for config in defaulted] == ['ami-default'] * 3
+    assert requested == [provisioning.DEFAULT_AMI_PARAMETER]
+
+
+def test_load_config_from_file_matches_with_and_without_orjson(tmp_path, monkeypatch):
+    if provisioning.orjson is None:
+        pytest.skip('orjson is not installed')
+
+    user_data_file = tmp_path / 'server.yml'
+    user_data_file.write_text('#cloud-config\nhostname: ${hostname}\nworkers: ${workers}\n')
+    config_file = tmp_path / 'config.json'
+    config_file.write_text(json.dumps([
+        {
+            'instance_type': 't3.small',
+            'name': 'server',
+            'user_data_file': str(user_data_file),
+            'tags': {'Project': 'Test'},
+            'spot_instance': False,
+            'hostname': 'web-01',
+            'workers': 4
+        },
+        {'instance_type': 'g4dn.xlarge', 'spot_max_price': '0.50', 'security_group_ids': ['sg-1']}
+    ]))
+
+    with_orjson = provisioning.load_config_from_file(str(config_file))
+    monkeypatch.setattr(provisioning, 'orjson', None)
+    with_json = provisioning.load_config_from_file(str(config_file))
+
+    assert with_orjson == with_json
+    assert with_json[0].user_data == '#cloud-config\nhostname: web-01\nworkers: 4\n'
+    assert with_json[0].user_data_file == str(user_data_file)
+    assert with_json[1] == EC2InstanceConfig(
+        instance_type='g4dn.xlarge', spot_max_price='0.50', security_group_ids=['sg-1']
+    )